@@ -1,45 +1,95 @@
 import numpy as np
-import pandas as pd
+import os
+import matplotlib
+# Render off-screen unless an interactive session is asked for
+if not os.environ.get("SWEEP_INTERACTIVE"):
+    matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import seaborn as sns
-import subprocess
-import os
+from parameter_sweep import EXECUTABLE_PATH, generate_lhs_samples, run_sweep_executable, load_results
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Numba is optional; without it the kernels below run as plain NumPy
+    NUMBA_AVAILABLE = False
+    def njit(*args, **kwargs):
+        return lambda func: func
 
-def run_parameter_sweep(num_samples=100, num_reruns=5, num_sims=10, num_timesteps=300, output_dir="./results"):
-    """Run the parameter sweep using the C++ executable"""
+# Parameter ranges for LHS, matching the defaults of the C++ sweep
+DEFAULT_RANGES = {
+    'nr_min': 200.0,
+    'nr_max': 800.0,
+    'dr_min': 0.5,
+    'dr_max': 1.0,
+    'df_min': 0.0,
+    'df_max': 0.25,
+    'rf_min': 0.25,
+    'rf_max': 0.75
+}
+
+def run_parameter_sweep(num_samples=100, num_reruns=5, num_sims=10, num_timesteps=300, output_dir="./results", ranges=DEFAULT_RANGES, seed=None, use_cache=True, num_threads=None):
+    """Run the parameter sweep using the C++ executable; seeded sweeps are cached unless use_cache is False"""
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    # Get the absolute path to the executable
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(current_dir))))
-    executable_path = os.path.join(project_root,"UM25", "Learning", "MV", "build", "bin", "parameter_sweep")
-    
-    print(f"Looking for executable at: {executable_path}")
-    if not os.path.exists(executable_path):
-        raise FileNotFoundError(f"Parameter sweep executable not found at: {executable_path}")
+    print(f"Looking for executable at: {EXECUTABLE_PATH}")
+    if not os.path.exists(EXECUTABLE_PATH):
+        raise FileNotFoundError(f"Parameter sweep executable not found at: {EXECUTABLE_PATH}")
     
-    # Run the parameter sweep executable
-    cmd = [
-        executable_path,
-        "--samples", str(num_samples),
-        "--reruns", str(num_reruns),
-        "--sims", str(num_sims),
-        "--timesteps", str(num_timesteps),
-        "--output", output_dir
-    ]
-    
-    print(f"Running command: {' '.join(cmd)}")
-    subprocess.run(cmd, check=True)
-    
-    # Find the CSV file in the output directory
-    csv_files = [f for f in os.listdir(output_dir) if f.endswith('.csv')]
-    if not csv_files:
-        raise FileNotFoundError("No CSV files found in output directory")
-    
-    # Read the most recent CSV file
-    latest_csv = max(csv_files, key=lambda x: os.path.getctime(os.path.join(output_dir, x)))
-    return pd.read_csv(os.path.join(output_dir, latest_csv))
+    # Sample in Python and hand the exact LHS design to the executable
+    samples = generate_lhs_samples(num_samples, ranges, seed=seed)
+    results_file = run_sweep_executable(EXECUTABLE_PATH, samples, num_reruns, num_sims, num_timesteps, output_dir,
+                                        use_cache=use_cache and seed is not None, num_threads=num_threads)
+    return load_results(results_file)
+
+@njit(cache=True, error_model='numpy')
+def _compute_stats(avg_prey, nr, std_prey, avg_predators, std_predators):
+    """Return normalized prey (avg_prey / nr) and the prey and predator CVs (std / avg)"""
+    return avg_prey / nr, std_prey / avg_prey, std_predators / avg_predators
+
+# Compile at import; with cache=True later runs load the compiled kernel from disk
+_ = _compute_stats(np.ones(1), np.ones(1), np.ones(1), np.ones(1), np.ones(1))
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def binned_means_2d(x, y, z, nx, ny):
+        """Mean of z over an nx-by-ny grid of equal-width (x, y) bins; empty bins are NaN"""
+        n = x.shape[0]
+        x_min, y_min = x.min(), y.min()
+        x_width = (x.max() - x_min) / nx or 1.0
+        y_width = (y.max() - y_min) / ny or 1.0
+
+        # Bin lookup is independent per point, so it runs in parallel
+        bins = np.empty(n, dtype=np.int64)
+        for i in prange(n):
+            ix = min(int((x[i] - x_min) / x_width), nx - 1)
+            iy = min(int((y[i] - y_min) / y_width), ny - 1)
+            bins[i] = ix * ny + iy
+
+        # Scatter-add serially to avoid races on shared bins
+        sums = np.zeros(nx * ny)
+        counts = np.zeros(nx * ny)
+        for i in range(n):
+            if np.isfinite(z[i]):
+                sums[bins[i]] += z[i]
+                counts[bins[i]] += 1
+
+        means = np.full(nx * ny, np.nan)
+        for b in prange(nx * ny):
+            if counts[b] > 0:
+                means[b] = sums[b] / counts[b]
+        return means.reshape((nx, ny))
+else:
+    def binned_means_2d(x, y, z, nx, ny):
+        """Mean of z over an nx-by-ny grid of equal-width (x, y) bins; empty bins are NaN"""
+        finite = np.isfinite(z)
+        value_range = [[x.min(), x.max()], [y.min(), y.max()]]
+        sums, _, _ = np.histogram2d(x[finite], y[finite], bins=(nx, ny), range=value_range, weights=z[finite])
+        counts, _, _ = np.histogram2d(x[finite], y[finite], bins=(nx, ny), range=value_range)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / counts, np.nan)
 
 def plot_results(df):
     """Create visualizations of the parameter sweep results"""
@@ -47,7 +97,12 @@ def plot_results(df):
     plots_dir = os.path.join(".", "plots")
     os.makedirs(plots_dir, exist_ok=True)
     plt.style.use('seaborn-v0_8')
-    df['normalized_prey'] = df['avg_prey'] / df['nr']
+    # Pull every column the plots need into a float64 array once
+    cols = {c: df[c].to_numpy(dtype=np.float64)
+            for c in ['nr', 'rf', 'avg_prey', 'avg_predators', 'std_prey', 'std_predators']}
+    normalized_prey, prey_cv, predator_cv = _compute_stats(
+        cols['avg_prey'], cols['nr'], cols['std_prey'], cols['avg_predators'], cols['std_predators'])
+    df['normalized_prey'] = normalized_prey
     print(df.head())
     # Create a figure with subplots
     fig = plt.figure(figsize=(18, 12))
@@ -62,8 +117,8 @@ def plot_results(df):
 
     # Plot 2: Prey vs Predator populations (with error bars)
     ax2 = plt.subplot(232)
-    ax2.errorbar(df['normalized_prey'], df['avg_predators'],  # Changed from avg_pred to avg_predators
-                 xerr=df['std_prey'], yerr=df['std_predators'],
+    ax2.errorbar(normalized_prey, cols['avg_predators'],  # Changed from avg_pred to avg_predators
+                 xerr=cols['std_prey'], yerr=cols['std_predators'],
                  fmt='o', alpha=0.5)
     ax2.set_xlabel('Average Prey Population')
     ax2.set_ylabel('Average Predator Population')
@@ -76,9 +131,7 @@ def plot_results(df):
 
     # Plot 4: Population stability (scatter of CVs)
     ax4 = plt.subplot(234)
-    ax4.scatter(df['std_prey'] / df['avg_prey'],
-                df['std_predators'] / df['avg_predators'],
-                alpha=0.5)
+    ax4.scatter(prey_cv, predator_cv, alpha=0.5)
     ax4.set_xlabel('Prey Population CV')
     ax4.set_ylabel('Predator Population CV')
     ax4.set_title('Population Stability')
@@ -86,11 +139,13 @@ def plot_results(df):
     # Plot 5: Distribution of Prey Population (Histogram)
     ax5 = plt.subplot(235)
     
-    # Normalize prey population by carrying capacity (nr)
-    df = df[np.isfinite(df['normalized_prey'])]
+    # Only keep samples whose normalized prey population (avg_prey / nr) is finite
+    finite = np.isfinite(normalized_prey)
+    # Fixed square-root rule shared by both histograms, avoiding the sort behind bins='auto'
+    nbins = max(20, int(np.sqrt(np.count_nonzero(finite))))
     
     # sns.histplot(df['normalized_prey'], kde=True, bins=20, color='blue', ax=ax5)
-    ax5.hist(df['normalized_prey'].to_numpy(), bins='auto', color='blue')
+    ax5.hist(normalized_prey[finite], bins=nbins, color='blue')
 
     ax5.set_xlabel('Normalized Prey Population (avg_prey / nr)')
     ax5.set_ylabel('Frequency')
@@ -99,14 +154,33 @@ def plot_results(df):
 
     # Plot 6: Distribution of Predator Population (Histogram)
     ax6 = plt.subplot(236)
-    ax6.hist(df['avg_predators'].to_numpy(), bins='auto', color='red')
+    ax6.hist(cols['avg_predators'][finite], bins=nbins, color='red')
     ax6.set_xlabel('Average Predator Population')
     ax6.set_ylabel('Frequency')
     ax6.set_title('Distribution of Predator Population')
 
     plt.tight_layout()
     plt.savefig(os.path.join(plots_dir, 'parameter_sweep_results.png'))
-    plt.show()
+    if os.environ.get("SWEEP_INTERACTIVE"):
+        plt.show()
+    plt.close()
+
+    # Mean normalized prey population over a grid of (NR, RF) bins
+    nr, rf = cols['nr'], cols['rf']
+    binned_prey = binned_means_2d(nr, rf, normalized_prey, 10, 10)
+    fig, ax = plt.subplots(figsize=(8, 6))
+    image = ax.imshow(binned_prey.T, origin='lower', aspect='auto', cmap='viridis',
+                      extent=[nr.min(), nr.max(), rf.min(), rf.max()])
+    fig.colorbar(image, ax=ax, label='Mean Normalized Prey Population')
+    ax.grid(False)
+    ax.set_xlabel('Carrying Capacity (NR)')
+    ax.set_ylabel('Predator Reproduction Rate (RF)')
+    ax.set_title('Normalized Prey Population by NR and RF')
+
+    plt.tight_layout()
+    plt.savefig(os.path.join(plots_dir, 'binned_normalized_prey.png'))
+    if os.environ.get("SWEEP_INTERACTIVE"):
+        plt.show()
     plt.close()
 
 
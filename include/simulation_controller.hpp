@@ -10,6 +10,7 @@
 #include <chrono>
 #include <memory>
 #include <numeric>
+#include <cstdint>
 
 // Forward declarations
 
@@ -35,9 +36,9 @@ private:
     std::chrono::steady_clock::time_point startTime;
     std::chrono::steady_clock::time_point endTime;
     
-    // Population history tracking
-    std::vector<int> predatorHistory;
-    std::vector<int> preyHistory;
+    // Population history tracking (uint16_t halves the buffer size; counts saturate at 65535)
+    std::vector<uint16_t> predatorHistory;
+    std::vector<uint16_t> preyHistory;
     
     // Population counters
     int predatorCount;
@@ -49,15 +50,12 @@ private:
     void updateHistory();
     void initializePopulation();
     
-    // Random distributions for movement and agent selection
+    // Random distributions for movement and agent selection; all draws use
+    // the context's RNG, so each simulation owns its random state
     std::uniform_real_distribution<double> positionDist;
     std::uniform_real_distribution<double> directionDist;
 
 public:
-    // Static RNG (thread-safe)
-    static std::mt19937 rng;
-    static std::uniform_real_distribution<double> reproDist;
-    static std::uniform_real_distribution<double> deathDist;
 
     /**
      * Constructor initializes the simulation with the given configuration.
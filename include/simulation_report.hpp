@@ -2,6 +2,8 @@
 
 #include <vector>
 #include <functional>
+#include <utility>
+#include <cstdint>
 #include <SFML/Graphics.hpp>
 #include "simulation_config.hpp"
 #include "simulation_context.hpp"
@@ -15,17 +17,19 @@ public:
     // simulationConfig is the configuration used for the simulation
     // timeSteps is the number of time steps in the simulation
     // The constructor initializes the report with the given data
+    // The history vectors are taken by value and moved into place, so callers
+    // passing temporaries (or std::move-ing) avoid copying them
     SimulationReport(
-        const std::vector<int> predator_history,
-        const std::vector<int> prey_history,
+        std::vector<uint16_t> predator_history,
+        std::vector<uint16_t> prey_history,
         int finalPredatorCount,
         int finalPreyCount,
         const SimulationConfig& config,
         int timeSteps,
         std::chrono::milliseconds executionTime,
         int normalizedPreyCount)
-        :   prey_history(prey_history),
-            predator_history(predator_history),
+        :   prey_history(std::move(prey_history)),
+            predator_history(std::move(predator_history)),
             finalPredatorCount(finalPredatorCount),
             finalPreyCount(finalPreyCount),
             simulationConfig(config),
@@ -39,15 +43,15 @@ public:
     int getNormalizedPreyCount() const {return normalizedPreyCount;}
     
     // Getters for history
-    std::vector<int> getPreyHistory() const { return prey_history; }
-    std::vector<int> getPredatorHistory() const { return predator_history; }
+    const std::vector<uint16_t>& getPreyHistory() const { return prey_history; }
+    const std::vector<uint16_t>& getPredatorHistory() const { return predator_history; }
 
     SimulationConfig getSimulationConfig() const { return simulationConfig; }
     int getTimeSteps() const { return timeSteps; }
 
     // Simulation data
-    std::vector<int> prey_history;
-    std::vector<int> predator_history;
+    std::vector<uint16_t> prey_history;
+    std::vector<uint16_t> predator_history;
     int finalPredatorCount;
     int finalPreyCount;
     SimulationConfig simulationConfig; 
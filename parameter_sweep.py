@@ -2,108 +2,126 @@
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from pyDOE2 import lhs
+from scipy.stats.qmc import LatinHypercube
 import subprocess
 import os
 import sys
-from datetime import datetime
+import shutil
+import hashlib
+import tempfile
+import time
 
-def generate_lhs_samples(num_samples, ranges):
+# Sweep executable built by build.sh, located relative to this script
+EXECUTABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "build", "bin", "parameter_sweep")
+
+# Directory holding results of previous sweeps, keyed by their inputs
+CACHE_DIR = ".sweep_cache"
+
+# Number of cached sweeps kept; the oldest are removed beyond this
+CACHE_MAX_ENTRIES = 20
+
+def generate_lhs_samples(num_samples, ranges, seed=None):
     """Generate Latin Hypercube samples for the given parameter ranges."""
     # Create normalized LHS samples (0-1 range)
-    lhs_samples = lhs(4, samples=num_samples)
+    lhs_samples = LatinHypercube(d=4, seed=seed).random(num_samples)
     
-    # Scale samples to parameter ranges
-    nr_samples = lhs_samples[:, 0] * (ranges['nr_max'] - ranges['nr_min']) + ranges['nr_min']
-    dr_samples = lhs_samples[:, 1] * (ranges['dr_max'] - ranges['dr_min']) + ranges['dr_min']
-    df_samples = lhs_samples[:, 2] * (ranges['df_max'] - ranges['df_min']) + ranges['df_min']
-    rf_samples = lhs_samples[:, 3] * (ranges['rf_max'] - ranges['rf_min']) + ranges['rf_min']
+    # Scale all four (NR, DR, DF, RF) columns to their ranges in one broadcast
+    lo = np.array([ranges['nr_min'], ranges['dr_min'], ranges['df_min'], ranges['rf_min']])
+    hi = np.array([ranges['nr_max'], ranges['dr_max'], ranges['df_max'], ranges['rf_max']])
+    
+    return lhs_samples * (hi - lo) + lo
+
+def latest_results_file(results_dir):
+    """Return the path of the most recently created CSV file in results_dir."""
+    results_files = [f for f in os.listdir(results_dir) if f.endswith('.csv')]
+    if not results_files:
+        raise FileNotFoundError(f"No CSV files found in {results_dir}")
+    
+    latest_file = max(results_files, key=lambda x: os.path.getctime(os.path.join(results_dir, x)))
+    return os.path.join(results_dir, latest_file)
+
+def load_results(results_file):
+    """Read a sweep results CSV into a DataFrame."""
+    return pd.read_csv(results_file)
+
+def sweep_cache_key(executable_path, samples, num_reruns, num_sims, num_timesteps):
+    """Hash the sweep inputs together with the executable's mtime, so rebuilds invalidate old results."""
+    key = hashlib.sha256()
+    key.update(np.ascontiguousarray(samples, dtype=np.float64).tobytes())
+    key.update(f"{num_reruns},{num_sims},{num_timesteps},{os.path.getmtime(executable_path)}".encode())
+    return key.hexdigest()
+
+def prune_sweep_cache(max_entries=CACHE_MAX_ENTRIES):
+    """Remove all but the max_entries most recently stored sweeps from the cache."""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    cached_files = sorted(
+        (os.path.join(CACHE_DIR, f) for f in os.listdir(CACHE_DIR) if f.endswith('.csv')),
+        key=os.path.getmtime, reverse=True)
+    for cached_file in cached_files[max_entries:]:
+        os.remove(cached_file)
+
+def clear_sweep_cache():
+    """Delete all cached sweep results."""
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+def run_sweep_executable(executable_path, samples, num_reruns, num_sims, num_timesteps, output_dir, use_cache=False, num_threads=None):
+    """Run the C++ sweep over the given samples and return the path of the results CSV.
+    
+    With use_cache, a sweep with the same samples, settings and executable build
+    as an earlier one is not rerun; the earlier results are copied into output_dir
+    instead. Only seeded samples ever repeat. The simulations themselves stay
+    stochastic, so a cache hit reuses the outcome of the earlier run rather than
+    drawing a fresh one. num_threads sets the executable's --threads; None keeps the
+    OpenMP default.
+    """
+    if use_cache:
+        cached_file = os.path.join(CACHE_DIR, sweep_cache_key(
+            executable_path, samples, num_reruns, num_sims, num_timesteps) + ".csv")
+        if os.path.exists(cached_file):
+            results_file = os.path.join(output_dir, time.strftime("sweep_%Y%m%d_%H%M%S.csv"))
+            print(f"Using cached results: {cached_file}")
+            shutil.copyfile(cached_file, results_file)
+            return results_file
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Hand the exact LHS design to the executable as (NR, DR, DF, RF) rows
+        samples_file = os.path.join(tmp_dir, "samples.csv")
+        np.savetxt(samples_file, samples, delimiter=",")
+        
+        cmd = [
+            executable_path,
+            "--samples-file", samples_file,
+            "--reruns", str(num_reruns),
+            "--sims", str(num_sims),
+            "--timesteps", str(num_timesteps),
+            "--output", output_dir
+        ]
+        if num_threads is not None:
+            cmd += ["--threads", str(num_threads)]
+        
+        print(f"Running command: {' '.join(cmd)}")
+        subprocess.run(cmd, check=True)
     
-    return np.column_stack((nr_samples, dr_samples, df_samples, rf_samples))
+    results_file = latest_results_file(output_dir)
+    if use_cache:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        shutil.copyfile(results_file, cached_file)
+        prune_sweep_cache()
+    return results_file
 
-def run_simulation(samples, num_reruns, num_sims, num_timesteps):
-    """Run the C++ simulation with the given parameter samples."""
+def run_simulation(samples, num_reruns, num_sims, num_timesteps, use_cache=False, num_threads=None):
+    """Run the C++ simulation with the given parameter samples and return the results file."""
     # Create output directory
     output_dir = "results"
     os.makedirs(output_dir, exist_ok=True)
     
-    # Run the C++ executable from the build/bin directory
-    executable_path = os.path.join("build", "bin", "parameter_sweep")
-    cmd = [
-        executable_path,
-        "--samples", str(len(samples)),
-        "--reruns", str(num_reruns),
-        "--sims", str(num_sims),
-        "--timesteps", str(num_timesteps),
-        "--output", output_dir
-    ]
-    
     try:
-        subprocess.run(cmd, check=True)
+        return run_sweep_executable(EXECUTABLE_PATH, samples, num_reruns, num_sims, num_timesteps, output_dir, use_cache, num_threads)
     except subprocess.CalledProcessError as e:
         print(f"Error running simulation: {e}")
         sys.exit(1)
 
-def plot_results(results_file):
-    """Create visualizations of the parameter sweep results."""
-    # Read results
-    df = pd.read_csv(results_file)
-    
-    # Create output directory for plots
-    plots_dir = "plots"
-    os.makedirs(plots_dir, exist_ok=True)
-    
-    # Plot 1: Parameter distributions
-    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
-    fig.suptitle("Parameter Distributions")
-    
-    parameters = ['nr', 'dr', 'df', 'rf']
-    titles = ['Carrying Capacity (NR)', 'Death Rate (DR)', 
-              'Predator Death Rate (DF)', 'Predator Reproduction Rate (RF)']
-    
-    for ax, param, title in zip(axes.flat, parameters, titles):
-        ax.hist(df[param], bins=20)
-        ax.set_title(title)
-        ax.set_xlabel(param.upper())
-        ax.set_ylabel('Count')
-    
-    plt.tight_layout()
-    plt.savefig(os.path.join(plots_dir, 'parameter_distributions.png'))
-    plt.close()
-    
-    # Plot 2: Population vs Parameters
-    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
-    fig.suptitle("Population vs Parameters")
-    
-    for ax, param, title in zip(axes.flat, parameters, titles):
-        ax.scatter(df[param], df['avg_predators'], label='Predators', alpha=0.5)
-        ax.scatter(df[param], df['avg_prey'], label='Prey', alpha=0.5)
-        ax.set_title(title)
-        ax.set_xlabel(param.upper())
-        ax.set_ylabel('Population')
-        ax.legend()
-    
-    plt.tight_layout()
-    plt.savefig(os.path.join(plots_dir, 'population_vs_parameters.png'))
-    plt.close()
-    
-    # Plot 3: Standard Deviations
-    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
-    fig.suptitle("Population Standard Deviations vs Parameters")
-    
-    for ax, param, title in zip(axes.flat, parameters, titles):
-        ax.scatter(df[param], df['std_predators'], label='Predators', alpha=0.5)
-        ax.scatter(df[param], df['std_prey'], label='Prey', alpha=0.5)
-        ax.set_title(title)
-        ax.set_xlabel(param.upper())
-        ax.set_ylabel('Standard Deviation')
-        ax.legend()
-    
-    plt.tight_layout()
-    plt.savefig(os.path.join(plots_dir, 'std_vs_parameters.png'))
-    plt.close()
-
 def main():
     # Parameter ranges
     ranges = {
@@ -122,28 +140,20 @@ def main():
     num_reruns = 2
     num_sims = 5
     num_timesteps = 300
+    seed = None  # Set to an int to fix the LHS design; repeats then reuse cached (stochastic) results
     
     # Generate samples
     print("Generating Latin Hypercube samples...")
-    samples = generate_lhs_samples(num_samples, ranges)
+    samples = generate_lhs_samples(num_samples, ranges, seed=seed)
     
     # Run simulation
     print("Running simulations...")
-    run_simulation(samples, num_reruns, num_sims, num_timesteps)
-    
-    # Find the most recent results file
-    results_dir = "results"
-    results_files = [f for f in os.listdir(results_dir) if f.endswith('.csv')]
-    if not results_files:
-        print("No results files found!")
-        sys.exit(1)
-    
-    latest_file = max(results_files, key=lambda x: os.path.getctime(os.path.join(results_dir, x)))
-    results_file = os.path.join(results_dir, latest_file)
+    results_file = run_simulation(samples, num_reruns, num_sims, num_timesteps, use_cache=seed is not None)
     
-    # Create visualizations
+    # Create visualizations; analyze_sweep builds on this module, so import it here
+    from analyze_sweep import plot_results
     print("Creating visualizations...")
-    plot_results(results_file)
+    plot_results(load_results(results_file))
     
     print("Parameter sweep completed successfully!")
 
@@ -11,6 +11,10 @@ class ParameterSweep {
 public:
     ParameterSweep(const std::string& output_dir);
     void run(int num_samples, int num_reruns, int num_sims, int num_timesteps);
+    // Run a sweep over pre-generated (NR, DR, DF, RF) samples
+    void run(const std::vector<std::vector<double>>& samples, int num_reruns, int num_sims, int num_timesteps);
+    // Load (NR, DR, DF, RF) samples from a headerless CSV file, one sample per row
+    static std::vector<std::vector<double>> loadSamples(const std::string& filename);
     
 private:
     std::string output_dir_;
@@ -8,8 +8,11 @@
 #include <chrono>
 #include <numeric>
 #include <cmath>
-// #include <future>  // For async and future
-// #include "thread_pool.hpp"
+#include <algorithm>
+#include <stdexcept>
+#ifdef _OPENMP
+#include <omp.h>
+#endif
 
 namespace fs = std::__fs::filesystem;
 
@@ -19,10 +22,6 @@ ParameterSweep::ParameterSweep(const std::string& output_dir)
 }
 
 void ParameterSweep::run(int num_samples, int num_reruns, int num_sims, int num_timesteps) {
-    std::cout << "Starting parameter sweep..." << std::endl;
-    auto start_time = std::chrono::high_resolution_clock::now();
-    std::vector<std::string> output_lines;  // Buffer for storing result lines
-
     // Define parameter ranges for LHS
     std::vector<LHSSampler::ParameterRange> ranges = {
         {200, 800},  // NR (carrying capacity)
@@ -33,47 +32,60 @@ void ParameterSweep::run(int num_samples, int num_reruns, int num_sims, int num_
 
     // Create LHS sampler
     LHSSampler sampler(ranges, num_samples);
-    auto samples = sampler.generateAllSamples();
+    run(sampler.generateAllSamples(), num_reruns, num_sims, num_timesteps);
+}
 
-    // Get the number of hardware threads
-    // unsigned int num_threads = std::min(static_cast<unsigned int>(std::thread::hardware_concurrency()), static_cast<unsigned int>(num_samples));
+void ParameterSweep::run(const std::vector<std::vector<double>>& samples, int num_reruns, int num_sims, int num_timesteps) {
+    std::cout << "Starting parameter sweep..." << std::endl;
+    auto start_time = std::chrono::high_resolution_clock::now();
+    int num_samples = static_cast<int>(samples.size());
 
-    // Create a thread pool
-    // ThreadPool pool(num_threads);
+    // Open the results file up front so each row is persisted as soon as its sample completes
+    std::string filename = generateOutputFilename();
+    std::ofstream outfile(filename);
+    outfile << "sample,nr,dr,df,rf,avg_prey,std_prey,avg_predators,std_predators,normalized_prey" << std::endl;
 
-    // Enqueue tasks in the thread pool
-    for (int i = 0; i < num_samples; ++i) {
-            auto start_time = std::chrono::high_resolution_clock::now();
+    // Report progress on a single, in-place status line, refreshed roughly
+    // every 1% of samples rather than after each one
+    int completed = 0;
+    const int report_every = std::max(1, num_samples / 100);
 
+    // Rows that finish out of order wait here until every earlier sample is
+    // written, keeping the file in sample order
+    std::vector<std::string> pending_rows(num_samples);
+    int next_row = 0;
+
+    // Parameters shared by every sample are set once; each sample copies this
+    // and only overrides the sampled values
+    SimulationConfig base_config;
+    base_config.worldWidth = 1.0;
+    base_config.worldHeight = 1.0;
+    base_config.initialPredators = 30;
+    base_config.MF = 0.05;
+    base_config.MR = 0.03;
+    base_config.interactionRadius = 0.02;
+    base_config.cellSize = 0.02;
+    base_config.simulationSteps = num_timesteps;
+    base_config.randomizeInitialPositions = true;
+    base_config.RR = 0.1;
+    base_config.saveStatistics = true;
+    base_config.outputFile = "simulation_stats.csv";
+
+    // Samples are independent, so spread them across all available cores.
+    // Dynamic scheduling keeps threads busy since run time varies with the parameters.
+    #pragma omp parallel for schedule(dynamic)
+    for (int i = 0; i < num_samples; ++i) {
             // Generate sample configuration
-            SimulationConfig config;
+            SimulationConfig config = base_config;
             config.NR = static_cast<int>(samples[i][0]);  // Carrying capacity + FOUND THE BUG
             config.DR = samples[i][1];  // Death rate
             config.DF = samples[i][2];  // Predator death rate
             config.RF = samples[i][3];  // Predator reproduction rate
-
-            // Set other parameters to default values
-            config.worldWidth = 1.0;
-            config.worldHeight = 1.0;
-            config.initialPredators = 30;
             config.initialPrey = std::min(500,static_cast<int>(config.NR));
-            config.MF = 0.05;
-            config.MR = 0.03;
-            config.interactionRadius = 0.02;
-            config.cellSize = 0.02;
-            config.simulationSteps = num_timesteps;
-            config.randomizeInitialPositions = true;
-            config.RR = 0.1;
-            config.saveStatistics = true;
-            config.outputFile = "simulation_stats.csv";
 
             // Run single sample and get results
             auto [avg_prey, std_prey, avg_pred, std_pred] = runSingleSample(config, num_reruns, num_sims, num_timesteps);
             double normalized_prey = avg_prey/config.NR;
-            auto end_time = std::chrono::high_resolution_clock::now();
-            auto duration = std::chrono::duration_cast<std::chrono::milliseconds>(end_time - start_time);
-            std::cout << "Completed sample " << (i + 1) << " of " << num_samples 
-                      << " in " << duration.count() << " milliseconds." << std::endl;
 
             // Format result line
             std::stringstream line;
@@ -88,22 +100,23 @@ void ParameterSweep::run(int num_samples, int num_reruns, int num_sims, int num_
                  << std_pred << "," 
                  << normalized_prey << "\n";
 
-            // Append the result line to the buffer (output_lines)
-            output_lines.push_back(line.str());
-    }
-
-    // Wait for all tasks to finish
-    // The ThreadPool destructor will join all threads automatically
-
-    // Write all results to file at once (this is done after all simulations are complete)
-    std::string filename = generateOutputFilename();
-    std::ofstream outfile(filename);
-    outfile << "sample,nr,dr,df,rf,avg_prey,std_prey,avg_predators,std_predators,normalized_prey\n";
-
-    // Write the buffered results
-    for (const auto& line : output_lines) {
-        outfile << line;
+            #pragma omp critical
+            {
+                pending_rows[i] = line.str();
+                while (next_row < num_samples && !pending_rows[next_row].empty()) {
+                    outfile << pending_rows[next_row];
+                    std::string().swap(pending_rows[next_row]);
+                    ++next_row;
+                }
+                outfile << std::flush;
+                ++completed;
+                if (completed % report_every == 0 || completed == num_samples) {
+                    std::cout << "\rCompleted " << completed << " of " << num_samples 
+                              << " samples" << std::flush;
+                }
+            }
     }
+    std::cout << std::endl;
 
     std::cout << "Parameter sweep completed. Results saved to: " << filename << std::endl;
     auto end_time = std::chrono::high_resolution_clock::now();
@@ -117,39 +130,41 @@ std::tuple<double, double, double, double> ParameterSweep::runSingleSample(
     int num_sims,
     int num_timesteps
 ) {
-    std::vector<double> prey_means;
-    std::vector<double> pred_means;
+    // One mean per rerun, preallocated and filled by index
+    std::vector<double> prey_means(num_reruns);
+    std::vector<double> pred_means(num_reruns);
+    
+    // One controller serves every run of this sample: initialize() resets its
+    // state while keeping the grid and history buffers already allocated
+    SimulationController controller(config);
     
     // Run multiple reruns
     for (int rerun = 0; rerun < num_reruns; ++rerun) {
-        std::vector<double> prey_counts;
-        std::vector<double> pred_counts;
+        // Running totals of the final counts; no per-simulation storage needed
+        double prey_total = 0.0;
+        double pred_total = 0.0;
         
         // Run multiple simulations
         auto t1 = std::chrono::high_resolution_clock::now();
         for (int sim = 0; sim < num_sims; ++sim) {
-            SimulationController controller(config);
-            
             // Run simulation for specified timesteps
             controller.initialize();
             controller.runForTimesteps(num_timesteps);
             controller.end();
 
             
-            // Get final population counts
-            auto report = controller.getReport();
-            prey_counts.push_back(report.getPreyCount());
-            pred_counts.push_back(report.getPredatorCount());
+            // Get final population counts; getReport() would also copy the full
+            // population histories, which the sweep never uses
+            SimulationStats stats = controller.getCurrentStats();
+            prey_total += stats.preyCount;
+            pred_total += stats.predatorCount;
         }
         auto t2 = std::chrono::high_resolution_clock::now();
         auto duration = std::chrono::duration_cast<std::chrono::milliseconds>(t2 - t1);
 
         // Calculate means for this rerun
-        double prey_mean = std::accumulate(prey_counts.begin(), prey_counts.end(), 0.0) / prey_counts.size();
-        double pred_mean = std::accumulate(pred_counts.begin(), pred_counts.end(), 0.0) / pred_counts.size();
-        
-        prey_means.push_back(prey_mean);
-        pred_means.push_back(pred_mean);
+        prey_means[rerun] = prey_total / num_sims;
+        pred_means[rerun] = pred_total / num_sims;
     }
 
     // Calculate overall statistics
@@ -173,6 +188,31 @@ std::tuple<double, double, double, double> ParameterSweep::runSingleSample(
     return {prey_avg, prey_std, pred_avg, pred_std};
 }
 
+std::vector<std::vector<double>> ParameterSweep::loadSamples(const std::string& filename) {
+    std::ifstream infile(filename);
+    if (!infile) {
+        throw std::runtime_error("Could not open samples file: " + filename);
+    }
+
+    std::vector<std::vector<double>> samples;
+    std::string row;
+    while (std::getline(infile, row)) {
+        if (row.empty()) continue;
+
+        std::vector<double> sample;
+        std::stringstream row_stream(row);
+        std::string value;
+        while (std::getline(row_stream, value, ',')) {
+            sample.push_back(std::stod(value));
+        }
+        if (sample.size() != 4) {
+            throw std::runtime_error("Expected 4 values (NR,DR,DF,RF) per row in samples file: " + filename);
+        }
+        samples.push_back(sample);
+    }
+    return samples;
+}
+
 std::string ParameterSweep::generateOutputFilename() const {
     std::stringstream ss;
     auto now = std::chrono::system_clock::now();
@@ -190,6 +230,8 @@ int main(int argc, char* argv[]) {
     int num_sims = 0;
     int num_timesteps = 0;
     std::string output_dir;
+    std::string samples_file;
+    int num_threads = 0;  // 0 keeps the OpenMP default (OMP_NUM_THREADS or one per logical CPU)
 
     for (int i = 1; i < argc; i += 2) {
         std::string arg = argv[i];
@@ -200,6 +242,8 @@ int main(int argc, char* argv[]) {
         
         if (arg == "--samples") {
             num_samples = std::stoi(argv[i + 1]);
+        } else if (arg == "--samples-file") {
+            samples_file = argv[i + 1];
         } else if (arg == "--reruns") {
             num_reruns = std::stoi(argv[i + 1]);
         } else if (arg == "--sims") {
@@ -208,19 +252,31 @@ int main(int argc, char* argv[]) {
             num_timesteps = std::stoi(argv[i + 1]);
         } else if (arg == "--output") {
             output_dir = argv[i + 1];
+        } else if (arg == "--threads") {
+            num_threads = std::stoi(argv[i + 1]);
         }
     }
 
     // Validate arguments
-    if (num_samples <= 0 || num_reruns <= 0 || num_sims <= 0 || num_timesteps <= 0 || output_dir.empty()) {
+    if ((num_samples <= 0 && samples_file.empty()) || num_reruns <= 0 || num_sims <= 0 || num_timesteps <= 0 || output_dir.empty()) {
         std::cerr << "Invalid or missing arguments" << std::endl;
-        std::cerr << "Usage: " << argv[0] << " --samples N --reruns N --sims N --timesteps N --output DIR" << std::endl;
+        std::cerr << "Usage: " << argv[0] << " (--samples N | --samples-file FILE) --reruns N --sims N --timesteps N --output DIR [--threads N]" << std::endl;
         return 1;
     }
 
+#ifdef _OPENMP
+    if (num_threads > 0) {
+        omp_set_num_threads(num_threads);
+    }
+#endif
+
     try {
         ParameterSweep sweep(output_dir);
-        sweep.run(num_samples, num_reruns, num_sims, num_timesteps);
+        if (!samples_file.empty()) {
+            sweep.run(ParameterSweep::loadSamples(samples_file), num_reruns, num_sims, num_timesteps);
+        } else {
+            sweep.run(num_samples, num_reruns, num_sims, num_timesteps);
+        }
     } catch (const std::exception& e) {
         std::cerr << "Error: " << e.what() << std::endl;
         return 1;
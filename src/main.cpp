@@ -14,8 +14,8 @@ void printReport(const SimulationReport& report) {
     std::cout << "Population History:\n";
     std::cout << std::setw(8) << "Step" << std::setw(12) << "Predators" << std::setw(12) << "Prey\n";
 
-    std::vector<int> reportPreyHistory = report.getPreyHistory();
-    std::vector<int> reportPredatorHistory = report.getPredatorHistory();
+    // const auto& reportPreyHistory = report.getPreyHistory();
+    // const auto& reportPredatorHistory = report.getPredatorHistory();
     // for (size_t i = 0; i < reportPreyHistory.size(); ++i) {
     //     std::cout << std::setw(8) << i 
     //               << std::setw(12) << reportPredatorHistory[i]
@@ -11,24 +11,17 @@
 #include <algorithm>
 #include <cmath>
 #include <climits>
+#include <limits>
 
-std::mt19937 SimulationController::rng(std::random_device{}());
-std::uniform_real_distribution<double> SimulationController::reproDist(0, 1);
-std::uniform_real_distribution<double> SimulationController::deathDist(0, 1);
-
-
-
-// Helper function to generate random positionå
+// Helper function to generate random position
 Position SimulationController::randomPosition() {
-    std::mt19937& rng = SimulationController::rng;
-    return Position{SimulationController::reproDist(rng), SimulationController::reproDist(rng)};
+    std::mt19937& rng = context.getRNG();
+    return Position{positionDist(rng), positionDist(rng)};
 }
 
 Position SimulationController::randomDirection() {
-    std::mt19937& rng = SimulationController::rng;
-    double x = 2*SimulationController::reproDist(rng)-1;
-    double y = 2*SimulationController::reproDist(rng)-1;
-    return Position{x, y};
+    std::mt19937& rng = context.getRNG();
+    return Position{directionDist(rng), directionDist(rng)};
 }
 
 
@@ -36,7 +29,9 @@ SimulationController::SimulationController(const SimulationConfig& config)
     : context(config),
       grid(config.cellSize),
       predatorHistory(config.simulationSteps, 0),
-      preyHistory(config.simulationSteps, 0){}
+      preyHistory(config.simulationSteps, 0),
+      positionDist(0.0, 1.0),
+      directionDist(-1.0, 1.0){}
 
 
 int SimulationController::agentCount() const{
@@ -71,9 +66,14 @@ void SimulationController::initializePopulation() {
     }
 }
 
+// Saturate a population count into the uint16_t range used by the histories
+static uint16_t toHistoryCount(int count) {
+    return static_cast<uint16_t>(std::clamp(count, 0, static_cast<int>(std::numeric_limits<uint16_t>::max())));
+}
+
 void SimulationController::updateHistory() {
-    predatorHistory.push_back(getCurrentPredatorCount());
-    preyHistory.push_back(getCurrentPreyCount());
+    predatorHistory.push_back(toHistoryCount(getCurrentPredatorCount()));
+    preyHistory.push_back(toHistoryCount(getCurrentPreyCount()));
 }
 
 void SimulationController::initialize() {
@@ -105,7 +105,7 @@ void SimulationController::updateSingleTimestep() {
     for (size_t i = 0; i < agentCount; ++i) {
         indices[i] = i;
     }
-    std::shuffle(indices.begin(), indices.end(), SimulationController::rng);
+    std::shuffle(indices.begin(), indices.end(), context.getRNG());
     
     // Process agents in random order
     for (size_t i = 0; i < agentCount; ++i) {